@@ -1,5 +1,7 @@
-from fastapi import FastAPI, HTTPException
+import os
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 from typing import Optional
 from core.session import VPSession
@@ -9,6 +11,9 @@ from core.vantage import consolidate, verify_discovery, set_goal, complete_vanta
 from core.paths import generate_paths, commit_path
 from core.receipt import generate_receipt
 from core.mode import detect_mode, get_mode_description
+from core.doorway_client import get_router
+from core import profiling, metrics
+from core.outbound import BackendError
 
 app = FastAPI(title="VantagePoint", version="0.1.0")
 app.add_middleware(CORSMiddleware, allow_origins=["*"],
@@ -18,6 +23,45 @@ app.add_middleware(CORSMiddleware, allow_origins=["*"],
 sessions = {}
 
 
+@app.exception_handler(BackendError)
+async def backend_error(request: Request, exc: BackendError):
+    """Backend unavailable or rate limited: 503, passing Retry-After on to the client."""
+    headers = {"Retry-After": str(max(1, round(exc.retry_after)))} if exc.retry_after else {}
+    return JSONResponse({"detail": str(exc)}, status_code=503, headers=headers)
+
+
+def install_profiling(app):
+    """Wrap requests in the sampling profiler when triggered by admin header or sample rate."""
+
+    @app.middleware("http")
+    async def profile_request(request: Request, call_next):
+        if not profiling.should_profile_request(request.headers.get(profiling.PROFILE_HEADER)):
+            return await call_next(request)
+        with profiling.profile(f"{request.method}-{request.url.path}") as name:
+            response = await call_next(request)
+        if name:
+            response.headers["X-VP-Profile"] = f"/profiles/{name}"
+        return response
+
+    @app.get("/profiles/{name}")
+    async def api_get_profile(name: str, request: Request):
+        if profiling.PROFILE_TOKEN and not profiling.is_admin(request.headers.get(profiling.PROFILE_HEADER)):
+            raise HTTPException(403, "Profile access requires the admin header")
+        try:
+            path = profiling.profile_path(name)
+        except ValueError:
+            raise HTTPException(404, "Profile not found")
+        if not os.path.exists(path):
+            raise HTTPException(404, "Profile not found")
+        with open(path) as f:
+            return PlainTextResponse(f.read())
+
+
+# Zero overhead unless a trigger is configured at startup
+if profiling.enabled():
+    install_profiling(app)
+
+
 class StartRequest(BaseModel):
     friction: str
 
@@ -55,7 +99,15 @@ class CommitRequest(BaseModel):
 @app.get("/health")
 async def health():
     mode = detect_mode()
-    return {"status": "ok", "engine": "vantagepoint", "mode": mode}
+    health = {"status": "ok", "engine": "vantagepoint", "mode": mode}
+    if mode == "doorway":
+        health["doorway"] = get_router().stats()
+    return health
+
+
+@app.get("/metrics")
+async def api_metrics():
+    return metrics.snapshot()
 
 
 @app.post("/session/start")
@@ -1,9 +1,62 @@
+import os
+import sys
 import argparse
-import uvicorn
+import subprocess
+
+# Cold-start budget per entry module, in milliseconds of import time
+STARTUP_BUDGET_MS = {
+    "cli": 50,
+    "main": 150,
+    "api.server": 1500,
+}
+
+
+def import_profile(module):
+    """
+    Import a module in a fresh interpreter under -X importtime.
+    Returns (total_ms, [(self_ms, name), ...]) slowest first.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed: {proc.stderr.strip().splitlines()[-1]}")
+    total_ms = 0.0
+    rows, pending = [], []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        head, cumulative, name = line.split("|")
+        pending.append((int(head.split(":")[1]) / 1000, name.strip()))
+        if not name.startswith("  "):
+            # Top-level entry closes a subtree; keep only the target's, not interpreter startup
+            if name.strip() == module:
+                total_ms, rows = int(cumulative) / 1000, pending
+            pending = []
+    rows.sort(reverse=True)
+    return total_ms, rows
+
+
+def report_import_profile(modules=None, top=8):
+    """Print import time per entry module against its budget. Returns True if all fit."""
+    ok = True
+    for module in modules or STARTUP_BUDGET_MS:
+        total_ms, rows = import_profile(module)
+        budget = STARTUP_BUDGET_MS.get(module)
+        within = budget is None or total_ms <= budget
+        ok = ok and within
+        print(f"{module}: {total_ms:.1f} ms (budget {budget} ms) {'ok' if within else 'OVER BUDGET'}")
+        for self_ms, name in rows[:top]:
+            print(f"  {self_ms:8.1f} ms  {name}")
+    return ok
 
 
 def main():
     parser = argparse.ArgumentParser(description="VantagePoint")
+    parser.add_argument("--import-profile", action="store_true",
+                        help="Report import time of the CLI and server against the startup budget")
     sub = parser.add_subparsers(dest="command")
     serve = sub.add_parser("serve", help="Start API server")
     serve.add_argument("--host", default="0.0.0.0")
@@ -11,7 +64,10 @@ def main():
     rp = sub.add_parser("run", help="Start interactive session")
     rp.add_argument("friction", type=str, help="What's wrong?")
     args = parser.parse_args()
+    if args.import_profile:
+        sys.exit(0 if report_import_profile() else 1)
     if args.command == "serve":
+        import uvicorn
         uvicorn.run("api.server:app", host=args.host, port=args.port)
     elif args.command == "run":
         from main import run_interactive
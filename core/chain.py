@@ -1,13 +1,14 @@
 import os
-from pruv import xy_wrap, CloudClient, XYChain
-
-PRUV_API_KEY = os.getenv("PRUV_API_KEY")  # None in local dev — fine
+from core.mode import load_env
 
 
 def get_wrapper(chain_name="vantagepoint"):
+    from pruv import xy_wrap  # deferred: only receipts need the chain stack
+    load_env()
+    api_key = os.getenv("PRUV_API_KEY")  # None in local dev — fine
     return xy_wrap(
         chain_name=chain_name, auto_redact=True,
-        **({"api_key": PRUV_API_KEY} if PRUV_API_KEY else {})
+        **({"api_key": api_key} if api_key else {})
     )
 
 
@@ -0,0 +1,72 @@
+import os
+import re
+import heapq
+from collections import Counter
+
+CONTEXT_TOKEN_BUDGET = int(os.getenv("VP_CONTEXT_TOKEN_BUDGET", "1500"))
+CHARS_PER_TOKEN = 4
+RECENCY_WEIGHT = 0.3
+FOCUS_WEIGHT = 0.7
+LABEL_OVERHEAD = 2     # quotes, comma and space around each listed label
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def estimate_tokens(text):
+    """Cheap token estimate (~4 characters per token). Good enough for budgeting."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN if text else 0
+
+
+def _terms(text):
+    return set(_WORD.findall(text.lower())) if text else set()
+
+
+def _label_tokens(node):
+    return estimate_tokens(node["label"]) + LABEL_OVERHEAD
+
+
+def select_context(nodes, focus=None, budget=None):
+    """
+    Choose which territory nodes to spell out in a prompt.
+    Everything is kept when it fits the token budget. Otherwise nodes are
+    ranked by significance, recency and term overlap with the focus area,
+    the top ones are kept (heap selection, O(n log k)), and the rest are
+    returned as per-type counts for a one-line summary.
+    Returns (selected nodes in territory order, Counter of omitted types).
+    """
+    budget = CONTEXT_TOKEN_BUDGET if budget is None else budget
+    if sum(_label_tokens(n) for n in nodes) <= budget:
+        return list(nodes), Counter()
+
+    total = len(nodes)
+    focus_terms = _terms(focus)
+
+    def score(item):
+        index, node = item
+        value = node.get("significance", 0.5) + RECENCY_WEIGHT * (index + 1) / total
+        if focus_terms:
+            label_terms = _terms(node["label"])
+            if label_terms:
+                value += FOCUS_WEIGHT * len(label_terms & focus_terms) / len(focus_terms)
+        return value
+
+    # Every listed label costs at least LABEL_OVERHEAD + 1 tokens, which bounds k
+    k = max(1, budget // (LABEL_OVERHEAD + 1))
+    ranked = heapq.nlargest(k, enumerate(nodes), key=score)
+
+    chosen, used = [], 0
+    for index, node in ranked:
+        cost = _label_tokens(node)
+        if used + cost > budget:
+            continue
+        chosen.append(index)
+        used += cost
+    keep = set(chosen)
+    selected = [nodes[i] for i in sorted(keep)]
+    omitted = Counter(n["type"] for i, n in enumerate(nodes) if i not in keep)
+    return selected, omitted
+
+
+def summarize_omitted(omitted):
+    """'12 ground, 3 unknown' style summary of nodes left out of a prompt."""
+    return ", ".join(f"{count} {node_type}" for node_type, count in sorted(omitted.items()))
@@ -1,17 +1,227 @@
 import os
-import httpx
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from core.mode import load_env
+from core.outbound import RateLimited, parse_retry_after, scheduler_from_env
+from core.singleflight import SingleFlight
 
-DOORWAY_API_URL = os.getenv("DOORWAY_API_URL")
+DOORWAY_TIMEOUT = 30.0
+LB_POLICY = os.getenv("DOORWAY_LB_POLICY", "least_outstanding")   # least_outstanding | ewma
+HEDGE = os.getenv("DOORWAY_HEDGE", "").lower() in ("1", "true", "yes")
+HEDGE_MIN_SAMPLES = int(os.getenv("DOORWAY_HEDGE_MIN_SAMPLES", "20"))  # latencies before p95 is trusted
+EJECT_AFTER = int(os.getenv("DOORWAY_EJECT_AFTER", "3"))              # consecutive failures
+EJECT_SECONDS = float(os.getenv("DOORWAY_EJECT_SECONDS", "30"))
+EWMA_ALPHA = 0.3
+LATENCY_WINDOW = 200
+
+_router = None
+_router_lock = threading.Lock()
+_inflight = SingleFlight("doorway")
+_scheduler = scheduler_from_env("doorway", default_concurrency=16)
+
+
+class Endpoint:
+    """One Doorway instance with its passive health and latency state."""
+
+    def __init__(self, url):
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.ewma = None            # seconds
+        self.failures = 0           # consecutive
+        self.ejected_until = 0.0
+
+    def score(self, policy):
+        latency = self.ewma or 0.0
+        if policy == "ewma":
+            return (latency * (self.outstanding + 1), self.outstanding)
+        return (self.outstanding, latency)
+
+    def to_dict(self):
+        return {
+            "url": self.url, "outstanding": self.outstanding,
+            "ewma_ms": round(self.ewma * 1000, 1) if self.ewma is not None else None,
+            "failures": self.failures, "healthy": time.monotonic() >= self.ejected_until,
+        }
+
+
+class _Attempt:
+    """One HTTP call to one endpoint. Cancel closes its client, aborting the request."""
+
+    def __init__(self, router, endpoint, payload):
+        import httpx  # deferred: only Doorway mode pays for it
+        self.router = router
+        self.endpoint = endpoint
+        self.payload = payload
+        self.cancelled = False
+        self.client = httpx.Client(timeout=DOORWAY_TIMEOUT, transport=router.transport)
+
+    def run(self):
+        start = time.monotonic()
+        healthy = False
+        try:
+            response = self.client.post(f"{self.endpoint.url}/run", json=self.payload)
+            healthy = response.status_code < 500     # 4xx is the caller's fault, not the endpoint's
+            response.raise_for_status()
+            return response.json()
+        finally:
+            if self.cancelled:
+                self.router.release(self.endpoint)
+            else:
+                self.router.release(self.endpoint, time.monotonic() - start, healthy)
+            self.client.close()
+
+    def cancel(self):
+        self.cancelled = True
+        self.client.close()
+
+
+class DoorwayRouter:
+    """
+    Spreads calls over several Doorway endpoints.
+    Selection is least-outstanding or latency-EWMA; endpoints that keep failing
+    are ejected for a cooldown. With hedging on, a duplicate goes to a second
+    endpoint once the first passes the observed p95, and the loser is cancelled.
+    """
+
+    def __init__(self, urls, policy=None, hedge=None, transport=None):
+        if not urls:
+            raise RuntimeError("DOORWAY_API_URL not set")
+        self.endpoints = [Endpoint(u) for u in urls]
+        self.policy = policy or LB_POLICY
+        self.hedge = HEDGE if hedge is None else hedge
+        self.transport = transport
+        self.hedges_sent = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def pick(self, exclude=()):
+        """Reserve the best endpoint. Falls back to ejected endpoints if none are healthy."""
+        with self._lock:
+            now = time.monotonic()
+            candidates = [e for e in self.endpoints if e not in exclude]
+            healthy = [e for e in candidates if now >= e.ejected_until]
+            pool = healthy or candidates
+            if not pool:
+                return None
+            endpoint = min(pool, key=lambda e: e.score(self.policy))
+            endpoint.outstanding += 1
+            return endpoint
+
+    def release(self, endpoint, elapsed=None, healthy=None):
+        """Return a reserved endpoint; healthy=None records no verdict (cancelled call)."""
+        with self._lock:
+            endpoint.outstanding -= 1
+            if healthy is None:
+                return
+            if not healthy:
+                endpoint.failures += 1
+                if endpoint.failures >= EJECT_AFTER:
+                    endpoint.ejected_until = time.monotonic() + EJECT_SECONDS
+                return
+            endpoint.failures = 0
+            endpoint.ejected_until = 0.0
+            endpoint.ewma = elapsed if endpoint.ewma is None else (
+                EWMA_ALPHA * elapsed + (1 - EWMA_ALPHA) * endpoint.ewma)
+            self._latencies.append(elapsed)
+
+    def p95(self):
+        """Observed p95 latency in seconds, or None until enough samples exist."""
+        with self._lock:
+            if len(self._latencies) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def call(self, payload):
+        delay = self.p95() if self.hedge and len(self.endpoints) > 1 else None
+        if delay is not None:
+            return self._hedged_call(payload, delay)
+        import httpx
+        endpoint = self.pick()
+        try:
+            return _Attempt(self, endpoint, payload).run()
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code < 500:
+                raise
+            # One failover to a different endpoint
+            fallback = self.pick(exclude={endpoint})
+            if fallback is None:
+                raise
+            return _Attempt(self, fallback, payload).run()
+
+    def _hedged_call(self, payload, delay):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="vp-doorway")
+        attempts = {}
+        primary = _Attempt(self, self.pick(), payload)
+        attempts[self._pool.submit(primary.run)] = primary
+        done, _ = wait(attempts, timeout=delay)
+        if not done:
+            endpoint = self.pick(exclude={primary.endpoint})
+            if endpoint is not None:
+                hedge = _Attempt(self, endpoint, payload)
+                attempts[self._pool.submit(hedge.run)] = hedge
+                with self._lock:
+                    self.hedges_sent += 1
+        pending = set(attempts)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        attempts[loser].cancel()
+                    return future.result()
+                if not attempts[future].cancelled:
+                    error = error or future.exception()
+        raise error
+
+    def stats(self):
+        return {
+            "policy": self.policy, "hedge": self.hedge, "hedges_sent": self.hedges_sent,
+            "endpoints": [e.to_dict() for e in self.endpoints],
+        }
+
+
+def parse_endpoints(value):
+    """DOORWAY_API_URL accepts one URL or a comma-separated list."""
+    return [u.strip() for u in (value or "").split(",") if u.strip()]
+
+
+def get_router():
+    """Router for the current DOORWAY_API_URL; rebuilt if the setting changes."""
+    global _router
+    load_env()
+    urls = parse_endpoints(os.getenv("DOORWAY_API_URL"))
+    if not urls:
+        raise RuntimeError("DOORWAY_API_URL not set")
+    with _router_lock:
+        if _router is None or [e.url for e in _router.endpoints] != [u.rstrip("/") for u in urls]:
+            _router = DoorwayRouter(urls)
+        return _router
 
 
 def call_doorway(input_text, session_name="vantagepoint"):
     """Call Doorway API. Returns full result dict."""
-    if not DOORWAY_API_URL:
-        raise RuntimeError("DOORWAY_API_URL not set")
-    response = httpx.post(
-        f"{DOORWAY_API_URL}/run",
-        json={"input": input_text, "session_name": session_name},
-        timeout=30.0,
+    router = get_router()
+    payload = {"input": input_text, "session_name": session_name}
+    # Identical concurrent inputs share one request, admitted by the outbound scheduler
+    return _inflight.do(
+        ("doorway", session_name, input_text),
+        lambda: _scheduler.run(lambda: _routed_call(router, payload)),
     )
-    response.raise_for_status()
-    return response.json()
+
+
+def _routed_call(router, payload):
+    import httpx
+    try:
+        return router.call(payload)
+    except httpx.HTTPStatusError as e:
+        retry_after = e.response.headers.get("retry-after")
+        if e.response.status_code == 429 or (e.response.status_code == 503 and retry_after):
+            raise RateLimited(f"Doorway rate limited ({e.response.status_code})", parse_retry_after(retry_after))
+        raise
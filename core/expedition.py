@@ -1,9 +1,12 @@
 import uuid
 from core.mode import Mode, detect_mode
 from core.doorway_client import call_doorway
-from core.llm_client import call_llm
+from core.llm_client import call_llm, require_success
+from core.context import select_context, summarize_omitted
+from core.profiling import profiled
 
 
+@profiled
 def expand_territory(session, focus=None):
     """
     Expand territory around friction or a specific focus area.
@@ -16,7 +19,7 @@ def expand_territory(session, focus=None):
         nodes, edges = _extract_territory_from_doorway(result, session)
         session.doorway_results.append(result)
     elif session.mode == Mode.LLM:
-        result = call_llm(prompt)
+        result = require_success(call_llm(prompt))
         nodes, edges = _extract_territory_from_llm(result, session)
     else:
         # Standalone: return the prompt for the user to analyze
@@ -104,10 +107,14 @@ def _build_expansion_prompt(session, focus):
     if focus:
         base += f"\n\nFocus area: {focus}"
     if session.territory["nodes"]:
-        known = [n["label"] for n in session.territory["nodes"] if n["type"] == "ground"]
-        conventional = [n["label"] for n in session.territory["nodes"] if n["type"] == "convention"]
-        unknown = [n["label"] for n in session.territory["nodes"] if n["type"] == "unknown"]
+        # Large territories are cut to a token budget, most relevant nodes first
+        selected, omitted = select_context(session.territory["nodes"], focus)
+        known = [n["label"] for n in selected if n["type"] == "ground"]
+        conventional = [n["label"] for n in selected if n["type"] == "convention"]
+        unknown = [n["label"] for n in selected if n["type"] == "unknown"]
         base += f"\n\nAlready mapped — Ground: {known}. Convention: {conventional}. Unknown: {unknown}."
+        if omitted:
+            base += f" Also mapped, not listed: {summarize_omitted(omitted)}."
     base += (
         "\n\nExpand the territory. Identify what is genuinely known (ground), "
         "what is assumed without evidence (convention), and what is genuinely unknown. "
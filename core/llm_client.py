@@ -1,32 +1,66 @@
 import os
 import json
-import urllib.request
-from dotenv import load_dotenv
+from core.mode import load_env
+from core.context import estimate_tokens
+from core.outbound import BackendError, RateLimited, parse_retry_after, scheduler_from_env
+from core.singleflight import SingleFlight
 
-load_dotenv()
+MAX_TOKENS = 500
 
-API_KEY = os.getenv("ANTHROPIC_API_KEY")
-MODEL = os.getenv("DOORWAY_MODEL", "claude-sonnet-4-20250514")
+_inflight = SingleFlight("llm")
+_scheduler = scheduler_from_env("llm", default_concurrency=8)
 
 
 def call_llm(prompt):
     """Call Anthropic API directly. Returns dict with answer."""
-    if not API_KEY:
+    load_env()
+    api_key = os.getenv("ANTHROPIC_API_KEY")
+    if not api_key:
         return {"answer": "[No API key]", "success": False}
+    model = os.getenv("DOORWAY_MODEL", "claude-sonnet-4-20250514")
+    # Identical concurrent prompts share one request
+    return _inflight.do(("llm", model, prompt), lambda: _call_scheduled(prompt, model, api_key))
+
+
+def require_success(result):
+    """Raise instead of letting an error answer become territory or a path."""
+    if result.get("success") is False:
+        raise BackendError(result.get("answer", "LLM call failed"), result.get("retry_after"))
+    return result
+
+
+def _call_scheduled(prompt, model, api_key):
+    try:
+        return _scheduler.run(
+            lambda: _post_messages(prompt, model, api_key),
+            tokens=estimate_tokens(prompt) + MAX_TOKENS,
+        )
+    except RateLimited as e:
+        return {"answer": "[LLM error: rate limited]", "success": False, "retry_after": e.retry_after}
+
+
+def _post_messages(prompt, model, api_key):
+    import urllib.error
+    import urllib.request  # deferred: keeps the network stack out of cold start
     payload = json.dumps({
-        "model": MODEL, "max_tokens": 500,
+        "model": model, "max_tokens": MAX_TOKENS,
         "messages": [{"role": "user", "content": prompt}]
     }).encode()
     req = urllib.request.Request(
         "https://api.anthropic.com/v1/messages", data=payload,
         headers={
             "Content-Type": "application/json",
-            "x-api-key": API_KEY,
+            "x-api-key": api_key,
             "anthropic-version": "2023-06-01",
         })
     try:
         with urllib.request.urlopen(req, timeout=30) as response:
             data = json.loads(response.read())
             return {"answer": data["content"][0]["text"], "success": True}
+    except urllib.error.HTTPError as e:
+        if e.code in (429, 503, 529):
+            # Raised to the scheduler, which pauses for Retry-After and retries
+            raise RateLimited(f"LLM rate limited ({e.code})", parse_retry_after(e.headers.get("retry-after")))
+        return {"answer": f"[LLM error: {str(e)[:120]}]", "success": False}
     except Exception as e:
         return {"answer": f"[LLM error: {str(e)[:120]}]", "success": False}
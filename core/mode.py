@@ -1,5 +1,7 @@
 import os
 
+_env_loaded = False
+
 
 class Mode:
     STANDALONE = "standalone"
@@ -7,8 +9,18 @@ class Mode:
     DOORWAY = "doorway"
 
 
+def load_env():
+    """Load .env once, on first use rather than as an import side effect."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+
 def detect_mode():
     """Strict priority: Doorway > LLM > Standalone."""
+    load_env()
     if os.getenv("DOORWAY_API_URL"):
         return Mode.DOORWAY
     elif os.getenv("ANTHROPIC_API_KEY"):
@@ -0,0 +1,167 @@
+import os
+import time
+import heapq
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from core import metrics
+
+PRIORITIES = {"interactive": 0, "batch": 1, "background": 2}
+MAX_RETRIES = int(os.getenv("VP_OUTBOUND_MAX_RETRIES", "3"))
+RETRY_AFTER_CAP = float(os.getenv("VP_RETRY_AFTER_CAP", "60"))   # seconds; ignore absurd server hints
+DEFAULT_RETRY_AFTER = 1.0
+
+_priority = contextvars.ContextVar("vp_priority", default="interactive")
+
+
+class BackendError(RuntimeError):
+    """A backend call failed; the caller must not treat the result as analysis."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimited(BackendError):
+    """Backend answered 429/503. retry_after is in seconds."""
+
+
+@contextmanager
+def priority(name):
+    """Run outbound calls in this block at the given priority class."""
+    if name not in PRIORITIES:
+        raise ValueError(f"Unknown priority {name}. Expected one of {list(PRIORITIES)}")
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority():
+    return _priority.get()
+
+
+def parse_retry_after(value):
+    """Retry-After in seconds (delta form), capped. HTTP-date form falls back to the default."""
+    try:
+        return min(max(float(value), 0.0), RETRY_AFTER_CAP)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at per_minute / 60 per second."""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount):
+        self.tokens -= min(amount, self.capacity)
+
+
+class OutboundScheduler:
+    """
+    Admits outbound backend calls in priority order under a concurrency cap and
+    optional request/token budgets per minute. A RateLimited failure pauses the
+    whole scheduler for Retry-After and the call is retried.
+    """
+
+    def __init__(self, name, concurrency=8, requests_per_minute=0, tokens_per_minute=0,
+                 max_retries=None):
+        self.name = name
+        self.concurrency = concurrency
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = MAX_RETRIES if max_retries is None else max_retries
+        self.active = 0
+        self.paused_until = 0.0
+        self._queue = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def run(self, fn, tokens=0, priority=None):
+        """Call fn once admitted; retries after Retry-After on RateLimited."""
+        rank = PRIORITIES[priority or current_priority()]
+        for attempt in range(self.max_retries + 1):
+            self._acquire(rank, tokens)
+            try:
+                return fn()
+            except RateLimited as e:
+                self._pause(e.retry_after)
+                metrics.incr(f"{self.name}.rate_limited")
+                if attempt == self.max_retries:
+                    raise
+            finally:
+                self._release()
+
+    def _acquire(self, rank, tokens):
+        with self._cond:
+            ticket = (rank, next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            queued_at = time.monotonic()
+            while True:
+                if self._queue[0] == ticket and self.active < self.concurrency:
+                    now = time.monotonic()
+                    delay = max(
+                        self.paused_until - now,
+                        self.requests.wait_time(1, now) if self.requests else 0.0,
+                        self.tokens.wait_time(tokens, now) if self.tokens and tokens else 0.0,
+                    )
+                    if delay <= 0:
+                        heapq.heappop(self._queue)
+                        self.active += 1
+                        if self.requests:
+                            self.requests.take(1)
+                        if self.tokens and tokens:
+                            self.tokens.take(tokens)
+                        metrics.incr(f"{self.name}.admitted")
+                        metrics.incr(f"{self.name}.queued_ms", int((now - queued_at) * 1000))
+                        self._cond.notify_all()
+                        return
+                    self._cond.wait(delay)
+                else:
+                    self._cond.wait()
+
+    def _release(self):
+        with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    def _pause(self, retry_after):
+        with self._cond:
+            delay = DEFAULT_RETRY_AFTER if retry_after is None else retry_after
+            self.paused_until = max(self.paused_until, time.monotonic() + delay)
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "active": self.active, "queued": len(self._queue),
+                "concurrency": self.concurrency,
+                "paused_for": round(max(0.0, self.paused_until - time.monotonic()), 3),
+            }
+
+
+def scheduler_from_env(name, default_concurrency):
+    """Build a scheduler from VP_<NAME>_CONCURRENCY / _RPM / _TPM."""
+    prefix = f"VP_{name.upper()}_"
+    return OutboundScheduler(
+        name,
+        concurrency=int(os.getenv(prefix + "CONCURRENCY", str(default_concurrency))),
+        requests_per_minute=float(os.getenv(prefix + "RPM", "0")),
+        tokens_per_minute=float(os.getenv(prefix + "TPM", "0")),
+    )
@@ -1,8 +1,10 @@
 from core.mode import Mode
 from core.doorway_client import call_doorway
-from core.llm_client import call_llm
+from core.llm_client import call_llm, require_success
+from core.profiling import profiled
 
 
+@profiled
 def generate_paths(session):
     """
     Generate three paths from the verified goal.
@@ -117,7 +119,7 @@ def _generate_llm_paths(session):
         f"C) Confirmed ground — safest path. No conventions broken.\n\n"
         f"For each: describe the approach, list assumptions, rate confidence (0-1), rate risk (low/moderate/high)."
     )
-    result = call_llm(prompt)
+    result = require_success(call_llm(prompt))
     # Parse into three paths — best effort
     answer = result.get("answer", "")
     return [
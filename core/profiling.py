@@ -0,0 +1,125 @@
+import os
+import sys
+import hmac
+import random
+import functools
+import threading
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_DIR = os.getenv("VP_PROFILE_DIR", "profiles")
+PROFILE_TOKEN = os.getenv("VP_PROFILE_TOKEN")                       # admin header value
+PROFILE_SAMPLE_RATE = float(os.getenv("VP_PROFILE_SAMPLE_RATE", "0"))  # fraction of API requests
+PROFILE_PHASE_RATE = float(os.getenv("VP_PROFILE_PHASE_RATE", "0"))    # fraction of phase calls
+PROFILE_INTERVAL = float(os.getenv("VP_PROFILE_INTERVAL", "0.005"))    # seconds between samples
+PROFILE_HEADER = "x-vp-profile"
+
+_active = contextvars.ContextVar("vp_profile_active", default=False)
+
+
+class SamplingProfiler:
+    """Statistical profiler: samples one thread's stack on an interval."""
+
+    def __init__(self, thread_id=None, interval=None):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval or PROFILE_INTERVAL
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="vp-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.stacks[_fold(frame)] += 1
+            self.samples += 1
+
+    def folded(self):
+        """Collapsed-stack text — the input format for flamegraph.pl and speedscope."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _fold(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def enabled():
+    """True when any profiling trigger is configured."""
+    return bool(PROFILE_TOKEN) or PROFILE_SAMPLE_RATE > 0
+
+
+def is_admin(header_value):
+    """True when the admin header carries the configured profile token."""
+    return bool(PROFILE_TOKEN and header_value and hmac.compare_digest(header_value, PROFILE_TOKEN))
+
+
+def should_profile_request(header_value):
+    """Profile when the admin header matches the token, else by sampling rate."""
+    if is_admin(header_value):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def profile_path(name):
+    """Resolve a profile file name inside PROFILE_DIR, refusing path traversal."""
+    if os.path.basename(name) != name or not name.endswith(".folded"):
+        raise ValueError(f"Invalid profile name: {name}")
+    return os.path.join(PROFILE_DIR, name)
+
+
+@contextmanager
+def profile(label):
+    """
+    Profile the current thread for the duration of the block.
+    Yields the profile file name (written on exit), or None if a profile
+    is already running in this context.
+    """
+    if _active.get():
+        yield None
+        return
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in label)[:60]
+    name = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}-{safe}.folded"
+    token = _active.set(True)
+    profiler = SamplingProfiler().start()
+    try:
+        yield name
+    finally:
+        profiler.stop()
+        _active.reset(token)
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        with open(profile_path(name), "w") as f:
+            f.write(profiler.folded())
+
+
+def profiled(fn):
+    """Profile a sampled fraction of calls to a phase function. No-op wrapper when disabled."""
+    if PROFILE_PHASE_RATE <= 0:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if random.random() >= PROFILE_PHASE_RATE:
+            return fn(*args, **kwargs)
+        with profile(fn.__name__):
+            return fn(*args, **kwargs)
+    return wrapper
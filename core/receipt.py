@@ -1,6 +1,8 @@
 from core.chain import get_wrapper, extract_receipt_info
+from core.profiling import profiled
 
 
+@profiled
 def generate_receipt(session):
     """Generate full session receipt with chain."""
     wrapper = get_wrapper(chain_name=f"vp_{session.id[:8]}")
@@ -0,0 +1,41 @@
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from core import metrics
+
+
+class SingleFlight:
+    """
+    Concurrent calls with the same key share one execution and its result.
+    The shared call runs on its own worker, so a waiter that gives up
+    (timeout, cancellation) never cancels it for the others.
+    """
+
+    def __init__(self, name, max_workers=64):
+        self.name = name
+        self.max_workers = max_workers
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def do(self, key, fn, timeout=None):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix=f"vp-{self.name}")
+                future = self._pool.submit(contextvars.copy_context().run, fn)
+                self._calls[key] = future
+                future.add_done_callback(lambda f: self._forget(key, f))
+        metrics.incr(f"{self.name}.calls" if leader else f"{self.name}.coalesced")
+        return future.result(timeout=timeout)
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
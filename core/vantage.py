@@ -1,8 +1,10 @@
 from core.mode import Mode
 from core.doorway_client import call_doorway
 from core.llm_client import call_llm
+from core.profiling import profiled
 
 
+@profiled
 def consolidate(session):
     """
     Consolidate territory into discoveries, assumptions, and goal.
@@ -1,4 +1,5 @@
 import pytest
+from unittest.mock import patch
 from fastapi.testclient import TestClient
 from api.server import app, sessions
 
@@ -27,6 +28,13 @@ class TestHealth:
         assert data["mode"] == "standalone"
 
 
+class TestMetrics:
+    def test_metrics_snapshot(self, client):
+        resp = client.get("/metrics")
+        assert resp.status_code == 200
+        assert isinstance(resp.json(), dict)
+
+
 class TestSessionStart:
     def test_start_session(self, client):
         resp = client.post("/session/start", json={"friction": "deploys break"})
@@ -106,6 +114,23 @@ class TestExpedition:
         assert resp.json()["classification"] == "convention"
 
 
+class TestBackendErrors:
+    def test_rate_limited_expansion_returns_503(self, client, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+        resp = client.post("/session/start", json={"friction": "test"})
+        sid = resp.json()["session_id"]
+        client.post(f"/session/{sid}/calibrate", json={
+            "what_wrong": "x", "how_long": "y", "what_right": "z"
+        })
+        client.post(f"/session/{sid}/provocation/complete")
+        failure = {"answer": "[LLM error: rate limited]", "success": False, "retry_after": 12}
+        with patch("core.expedition.call_llm", return_value=failure):
+            resp = client.post(f"/session/{sid}/expedition/expand", json={})
+        assert resp.status_code == 503
+        assert resp.headers["retry-after"] == "12"
+        assert sessions[sid].territory["nodes"] == []
+
+
 class TestVantage:
     @pytest.fixture
     def vantage_session(self, client):
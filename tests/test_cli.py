@@ -0,0 +1,54 @@
+import os
+import sys
+import json
+import subprocess
+import pytest
+import cli
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _loaded_after_import(module, candidates):
+    """Import a module in a fresh interpreter; return which candidates ended up in sys.modules."""
+    code = (
+        f"import sys, json, {module}; "
+        f"print(json.dumps([m for m in {candidates!r} if m in sys.modules]))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT, check=True)
+    return json.loads(out.stdout)
+
+
+class TestLazyImports:
+    def test_cli_does_not_import_server_stack(self):
+        assert _loaded_after_import("cli", ["uvicorn", "fastapi", "main"]) == []
+
+    def test_main_defers_backends_and_chain(self):
+        loaded = _loaded_after_import("main", ["pruv", "httpx", "dotenv", "urllib.request", "uvicorn"])
+        assert loaded == []
+
+    def test_server_defers_backends_and_chain(self):
+        assert _loaded_after_import("api.server", ["pruv", "httpx", "uvicorn"]) == []
+
+
+class TestImportProfile:
+    def test_reports_module_total(self):
+        total_ms, rows = cli.import_profile("main")
+        assert total_ms > 0
+        names = [name for _, name in rows]
+        assert "main" in names
+        assert "core.expedition" in names
+        # Interpreter startup is not attributed to the module
+        assert "site" not in names
+
+    @pytest.mark.parametrize("module", ["cli", "main"])
+    def test_within_startup_budget(self, module):
+        total_ms, _ = cli.import_profile(module)
+        assert total_ms <= cli.STARTUP_BUDGET_MS[module]
+
+    def test_import_profile_flag(self, monkeypatch, capsys):
+        monkeypatch.setattr(sys, "argv", ["vantagepoint", "--import-profile"])
+        monkeypatch.setattr(cli, "STARTUP_BUDGET_MS", {"cli": 10_000})
+        with pytest.raises(SystemExit) as exc:
+            cli.main()
+        assert exc.value.code == 0
+        assert "cli:" in capsys.readouterr().out
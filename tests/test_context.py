@@ -0,0 +1,61 @@
+import time
+import pytest
+from core.context import estimate_tokens, select_context, summarize_omitted
+
+
+def _node(label, node_type="convention", significance=0.5):
+    return {"id": label[:8], "label": label, "type": node_type, "significance": significance}
+
+
+class TestEstimateTokens:
+    def test_empty(self):
+        assert estimate_tokens("") == 0
+
+    def test_rounds_up(self):
+        assert estimate_tokens("abcde") == 2
+
+
+class TestSelectContext:
+    def test_keeps_everything_within_budget(self):
+        nodes = [_node("a"), _node("b", "ground")]
+        selected, omitted = select_context(nodes, budget=100)
+        assert selected == nodes
+        assert not omitted
+
+    def test_prefers_significant_nodes(self):
+        nodes = [_node(f"filler node {i}", significance=0.1) for i in range(50)]
+        nodes.insert(10, _node("critical finding", "unknown", significance=1.0))
+        selected, omitted = select_context(nodes, budget=20)
+        assert "critical finding" in [n["label"] for n in selected]
+        assert sum(omitted.values()) == len(nodes) - len(selected)
+
+    def test_prefers_focus_related_nodes(self):
+        nodes = [_node(f"unrelated item {i}") for i in range(50)]
+        nodes.insert(0, _node("release pipeline flakiness"))
+        selected, _ = select_context(nodes, focus="pipeline", budget=12)
+        assert "release pipeline flakiness" in [n["label"] for n in selected]
+
+    def test_keeps_territory_order(self):
+        nodes = [_node(f"node {i}", significance=i / 100) for i in range(100)]
+        selected, _ = select_context(nodes, budget=40)
+        indexes = [int(n["label"].split()[1]) for n in selected]
+        assert indexes == sorted(indexes)
+
+    def test_respects_budget(self):
+        nodes = [_node("x" * 40) for _ in range(100)]
+        selected, _ = select_context(nodes, budget=100)
+        assert sum(estimate_tokens(n["label"]) + 2 for n in selected) <= 100
+
+    def test_large_territory_is_fast(self):
+        nodes = [_node(f"label number {i}", ("ground", "convention", "unknown")[i % 3], (i % 97) / 97)
+                 for i in range(100_000)]
+        start = time.perf_counter()
+        selected, omitted = select_context(nodes, focus="number", budget=1500)
+        assert time.perf_counter() - start < 2.0
+        assert len(selected) + sum(omitted.values()) == 100_000
+
+
+class TestSummarizeOmitted:
+    def test_summary(self):
+        from collections import Counter
+        assert summarize_omitted(Counter({"unknown": 3, "ground": 12})) == "12 ground, 3 unknown"
@@ -0,0 +1,141 @@
+import time
+import threading
+import httpx
+import pytest
+from core import doorway_client
+from core.doorway_client import DoorwayRouter, call_doorway, get_router, parse_endpoints
+
+RESULT = {"status": "GROUND", "content": {"answer": "ok"}, "structure": {"gap_score": 0.1}}
+
+
+def _transport(delays=None, statuses=None, calls=None):
+    """Mock transport: per-host delay and status, recording which hosts were hit."""
+    delays = delays or {}
+    statuses = statuses or {}
+
+    def handler(request):
+        host = request.url.host
+        if calls is not None:
+            calls.append(host)
+        time.sleep(delays.get(host, 0))
+        status = statuses.get(host, 200)
+        if status == "down":
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(status, json={**RESULT, "host": host})
+    return httpx.MockTransport(handler)
+
+
+class TestParseEndpoints:
+    def test_single_url(self):
+        assert parse_endpoints("http://a:8000") == ["http://a:8000"]
+
+    def test_comma_separated(self):
+        assert parse_endpoints("http://a:8000, http://b:8000,") == ["http://a:8000", "http://b:8000"]
+
+    def test_empty(self):
+        assert parse_endpoints(None) == []
+
+
+class TestSelection:
+    def test_least_outstanding(self):
+        router = DoorwayRouter(["http://a", "http://b"], policy="least_outstanding")
+        first = router.pick()
+        second = router.pick()
+        assert {first.url, second.url} == {"http://a", "http://b"}
+
+    def test_ewma_prefers_faster_endpoint(self):
+        router = DoorwayRouter(["http://a", "http://b"], policy="ewma")
+        a, b = router.endpoints
+        for _ in range(3):
+            router.pick()
+            router.release(a, 0.5, True)
+            router.pick()
+            router.release(b, 0.05, True)
+        assert router.pick() is b
+
+    def test_ejects_failing_endpoint(self, monkeypatch):
+        monkeypatch.setattr(doorway_client, "EJECT_AFTER", 2)
+        router = DoorwayRouter(["http://a", "http://b"])
+        a = router.endpoints[0]
+        for _ in range(2):
+            router.release(router.pick(exclude={router.endpoints[1]}), 0.1, False)
+        assert router.stats()["endpoints"][0]["healthy"] is False
+        assert all(router.pick() is not a for _ in range(3))
+
+    def test_all_ejected_fails_open(self, monkeypatch):
+        monkeypatch.setattr(doorway_client, "EJECT_AFTER", 1)
+        router = DoorwayRouter(["http://a"])
+        router.release(router.pick(), 0.1, False)
+        assert router.pick() is router.endpoints[0]
+
+
+class TestCall:
+    def test_returns_result(self):
+        router = DoorwayRouter(["http://a"], transport=_transport())
+        assert router.call({"input": "x"})["host"] == "a"
+
+    def test_fails_over_on_connection_error(self):
+        calls = []
+        router = DoorwayRouter(["http://a", "http://b"], transport=_transport(statuses={"a": "down"}, calls=calls))
+        router.endpoints[1].outstanding = 1  # force "a" first
+        result = router.call({"input": "x"})
+        assert result["host"] == "b"
+        assert calls == ["a", "b"]
+        assert router.endpoints[0].failures == 1
+
+    def test_client_error_is_not_retried(self):
+        calls = []
+        router = DoorwayRouter(["http://a", "http://b"], transport=_transport(statuses={"a": 422, "b": 422}, calls=calls))
+        with pytest.raises(httpx.HTTPStatusError):
+            router.call({"input": "x"})
+        assert len(calls) == 1
+        assert all(e.failures == 0 for e in router.endpoints)
+
+
+class TestHedging:
+    def _warm(self, router, latency=0.01):
+        for endpoint in router.endpoints:
+            for _ in range(10):
+                router.pick()
+                router.release(endpoint, latency, True)
+
+    def test_no_hedge_without_samples(self, monkeypatch):
+        router = DoorwayRouter(["http://a", "http://b"], hedge=True, transport=_transport())
+        assert router.p95() is None
+        router.call({"input": "x"})
+        assert router.hedges_sent == 0
+
+    def test_hedge_beats_slow_primary(self, monkeypatch):
+        monkeypatch.setattr(doorway_client, "HEDGE_MIN_SAMPLES", 5)
+        router = DoorwayRouter(["http://a", "http://b"], hedge=True,
+                               transport=_transport(delays={"a": 0.5}))
+        self._warm(router)
+        router.endpoints[1].outstanding = 1  # primary goes to slow "a"
+        start = time.monotonic()
+        result = router.call({"input": "x"})
+        assert result["host"] == "b"
+        assert time.monotonic() - start < 0.4
+        assert router.hedges_sent == 1
+
+    def test_fast_primary_sends_no_hedge(self, monkeypatch):
+        monkeypatch.setattr(doorway_client, "HEDGE_MIN_SAMPLES", 5)
+        router = DoorwayRouter(["http://a", "http://b"], hedge=True, transport=_transport())
+        self._warm(router, latency=0.2)
+        assert router.call({"input": "x"})["status"] == "GROUND"
+        assert router.hedges_sent == 0
+
+
+class TestGetRouter:
+    def test_requires_url(self, monkeypatch):
+        monkeypatch.delenv("DOORWAY_API_URL", raising=False)
+        with pytest.raises(RuntimeError, match="DOORWAY_API_URL"):
+            call_doorway("x")
+
+    def test_rebuilds_when_setting_changes(self, monkeypatch):
+        monkeypatch.setenv("DOORWAY_API_URL", "http://a")
+        first = get_router()
+        assert get_router() is first
+        monkeypatch.setenv("DOORWAY_API_URL", "http://a,http://b")
+        second = get_router()
+        assert second is not first
+        assert len(second.endpoints) == 2
@@ -7,6 +7,7 @@ from core.expedition import (
     _extract_territory_from_doorway, _extract_territory_from_llm,
 )
 from core.mode import Mode
+from core.outbound import BackendError
 
 
 @pytest.fixture
@@ -84,6 +85,14 @@ class TestExpandTerritoryLLM:
         assert expedition_entries[0]["action"] == "territory_expanded"
 
 
+    @patch("core.expedition.call_llm")
+    def test_failed_call_adds_no_node(self, mock_llm, llm_session):
+        mock_llm.return_value = {"answer": "[LLM error: rate limited]", "success": False, "retry_after": 5}
+        with pytest.raises(BackendError):
+            expand_territory(llm_session)
+        assert llm_session.territory["nodes"] == []
+
+
 class TestExpandTerritoryDoorway:
     @patch("core.expedition.call_doorway")
     def test_calls_doorway_and_parses_result(self, mock_doorway, doorway_session):
@@ -277,6 +286,15 @@ class TestBuildExpansionPrompt:
         assert "assumed thing" in prompt
         assert "Already mapped" in prompt
 
+    def test_large_territory_is_budgeted(self, standalone_session):
+        for i in range(2000):
+            add_node(standalone_session, f"minor detail number {i}", "convention", 0.1)
+        add_node(standalone_session, "the one critical fact", "ground", 1.0)
+        prompt = _build_expansion_prompt(standalone_session, None)
+        assert "the one critical fact" in prompt
+        assert "Also mapped, not listed:" in prompt
+        assert len(prompt) < 10_000
+
 
 class TestExtractTerritoryFromDoorway:
     def test_ground_status(self, standalone_session):
@@ -0,0 +1,160 @@
+import time
+import threading
+import pytest
+from unittest.mock import patch
+from core import metrics, outbound, llm_client
+from core.outbound import (
+    OutboundScheduler, TokenBucket, RateLimited, BackendError,
+    priority, current_priority, parse_retry_after,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+
+
+class TestTokenBucket:
+    def test_starts_full(self):
+        bucket = TokenBucket(60)
+        assert bucket.wait_time(60, time.monotonic()) == 0.0
+
+    def test_wait_after_drain(self):
+        bucket = TokenBucket(60)  # one token per second
+        now = time.monotonic()
+        bucket.wait_time(60, now)
+        bucket.take(60)
+        assert bucket.wait_time(2, now) == pytest.approx(2.0, abs=0.01)
+
+    def test_oversized_request_clamped_to_capacity(self):
+        bucket = TokenBucket(10)
+        assert bucket.wait_time(1000, time.monotonic()) == 0.0
+
+
+class TestParseRetryAfter:
+    def test_seconds(self):
+        assert parse_retry_after("2") == 2.0
+
+    def test_capped(self, monkeypatch):
+        monkeypatch.setattr(outbound, "RETRY_AFTER_CAP", 5.0)
+        assert parse_retry_after("3600") == 5.0
+
+    def test_unparseable_uses_default(self):
+        assert parse_retry_after("Wed, 21 Oct 2026 07:28:00 GMT") == outbound.DEFAULT_RETRY_AFTER
+        assert parse_retry_after(None) == outbound.DEFAULT_RETRY_AFTER
+
+
+class TestPriority:
+    def test_default_is_interactive(self):
+        assert current_priority() == "interactive"
+
+    def test_context(self):
+        with priority("batch"):
+            assert current_priority() == "batch"
+        assert current_priority() == "interactive"
+
+    def test_unknown_priority(self):
+        with pytest.raises(ValueError):
+            with priority("urgent"):
+                pass
+
+
+class TestScheduler:
+    def test_runs_call(self):
+        scheduler = OutboundScheduler("t", concurrency=2)
+        assert scheduler.run(lambda: 42) == 42
+        assert metrics.get("t.admitted") == 1
+
+    def test_concurrency_cap(self):
+        scheduler = OutboundScheduler("t", concurrency=2)
+        peak, active, lock = [0], [0], threading.Lock()
+
+        def work():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.03)
+            with lock:
+                active[0] -= 1
+
+        threads = [threading.Thread(target=scheduler.run, args=(work,)) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert peak[0] == 2
+
+    def test_interactive_preempts_queued_batch(self):
+        scheduler = OutboundScheduler("t", concurrency=1)
+        release = threading.Event()
+        order = []
+
+        def queue(name, prio):
+            t = threading.Thread(target=scheduler.run, args=(lambda: order.append(name),),
+                                 kwargs={"priority": prio})
+            t.start()
+            return t
+
+        holder = threading.Thread(target=scheduler.run, args=(release.wait,))
+        holder.start()
+        time.sleep(0.02)
+        threads = [queue("batch-1", "batch"), queue("background", "background")]
+        time.sleep(0.02)
+        threads.append(queue("interactive", "interactive"))
+        time.sleep(0.02)
+        release.set()
+        for t in [holder] + threads:
+            t.join()
+        assert order == ["interactive", "batch-1", "background"]
+
+    def test_retries_after_rate_limit(self):
+        scheduler = OutboundScheduler("t", concurrency=1, max_retries=2)
+        attempts = []
+
+        def flaky():
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise RateLimited("429", retry_after=0.05)
+            return "ok"
+
+        assert scheduler.run(flaky) == "ok"
+        assert attempts[1] - attempts[0] >= 0.05
+        assert metrics.get("t.rate_limited") == 1
+
+    def test_gives_up_after_max_retries(self):
+        scheduler = OutboundScheduler("t", concurrency=1, max_retries=1)
+
+        def always_limited():
+            raise RateLimited("429", retry_after=0.01)
+
+        with pytest.raises(RateLimited):
+            scheduler.run(always_limited)
+        assert scheduler.active == 0
+
+    def test_token_budget_delays_call(self):
+        scheduler = OutboundScheduler("t", concurrency=4, tokens_per_minute=600)  # 10 tokens/s
+        scheduler.run(lambda: None, tokens=600)
+        start = time.monotonic()
+        scheduler.run(lambda: None, tokens=1)
+        assert time.monotonic() - start >= 0.09
+
+
+class TestLLMRateLimiting:
+    def test_rate_limit_becomes_failure_not_answer(self, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+        monkeypatch.setattr(llm_client, "_scheduler", OutboundScheduler("llm", max_retries=0))
+
+        def limited(prompt, model, api_key):
+            raise RateLimited("LLM rate limited (429)", retry_after=7)
+
+        with patch.object(llm_client, "_post_messages", limited):
+            result = llm_client.call_llm("prompt")
+        assert result["success"] is False
+        assert result["retry_after"] == 7
+        with pytest.raises(BackendError) as exc:
+            llm_client.require_success(result)
+        assert exc.value.retry_after == 7
+
+    def test_require_success_passes_answers(self):
+        result = {"answer": "fine", "success": True}
+        assert llm_client.require_success(result) is result
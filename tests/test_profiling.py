@@ -0,0 +1,113 @@
+import os
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from core import profiling
+from api.server import install_profiling
+
+
+def _busy(seconds=0.05):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling, "PROFILE_INTERVAL", 0.001)
+    return tmp_path
+
+
+class TestSamplingProfiler:
+    def test_collects_folded_stacks(self):
+        profiler = profiling.SamplingProfiler(interval=0.001).start()
+        _busy()
+        profiler.stop()
+        assert profiler.samples > 0
+        folded = profiler.folded()
+        assert "_busy" in folded
+        # Collapsed-stack format: "frame;frame;frame count"
+        stack, count = folded.splitlines()[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert ";" in stack
+
+
+class TestProfileContext:
+    def test_writes_profile_file(self, profile_dir):
+        with profiling.profile("expand") as name:
+            _busy()
+        assert name.endswith(".folded")
+        content = (profile_dir / name).read_text()
+        assert "_busy" in content
+
+    def test_nested_profile_is_noop(self, profile_dir):
+        with profiling.profile("outer") as outer:
+            with profiling.profile("inner") as inner:
+                _busy(0.01)
+        assert outer is not None
+        assert inner is None
+        assert len(os.listdir(profile_dir)) == 1
+
+    def test_rejects_path_traversal(self):
+        with pytest.raises(ValueError):
+            profiling.profile_path("../secrets.folded")
+
+
+class TestProfiledDecorator:
+    def test_returns_original_when_disabled(self, monkeypatch):
+        monkeypatch.setattr(profiling, "PROFILE_PHASE_RATE", 0.0)
+        assert profiling.profiled(_busy) is _busy
+
+    def test_profiles_sampled_calls(self, profile_dir, monkeypatch):
+        monkeypatch.setattr(profiling, "PROFILE_PHASE_RATE", 1.0)
+        wrapped = profiling.profiled(_busy)
+        assert wrapped(0.01) > 0
+        files = os.listdir(profile_dir)
+        assert len(files) == 1
+        assert "_busy" in files[0]
+
+
+class TestRequestProfiling:
+    @pytest.fixture
+    def client(self, profile_dir, monkeypatch):
+        monkeypatch.setattr(profiling, "PROFILE_TOKEN", "admin-secret")
+        monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", 0.0)
+        app = FastAPI()
+
+        @app.get("/work")
+        async def work():
+            return {"total": _busy(0.02)}
+
+        install_profiling(app)
+        return TestClient(app)
+
+    def test_no_header_no_profile(self, client, profile_dir):
+        resp = client.get("/work")
+        assert resp.status_code == 200
+        assert "x-vp-profile" not in resp.headers
+        assert os.listdir(profile_dir) == []
+
+    def test_wrong_token_no_profile(self, client):
+        resp = client.get("/work", headers={"X-VP-Profile": "guess"})
+        assert "x-vp-profile" not in resp.headers
+
+    def test_admin_header_links_profile(self, client):
+        resp = client.get("/work", headers={"X-VP-Profile": "admin-secret"})
+        link = resp.headers["x-vp-profile"]
+        assert link.startswith("/profiles/")
+        profile = client.get(link, headers={"X-VP-Profile": "admin-secret"})
+        assert profile.status_code == 200
+        assert "_busy" in profile.text
+
+    def test_profile_fetch_requires_token(self, client):
+        link = client.get("/work", headers={"X-VP-Profile": "admin-secret"}).headers["x-vp-profile"]
+        assert client.get(link).status_code == 403
+
+    def test_sampling_rate_triggers_profile(self, client, monkeypatch):
+        monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", 1.0)
+        resp = client.get("/work")
+        assert resp.headers["x-vp-profile"].startswith("/profiles/")
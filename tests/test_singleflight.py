@@ -0,0 +1,100 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import pytest
+from unittest.mock import patch
+from core import metrics
+from core import llm_client
+from core.singleflight import SingleFlight
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+
+
+def _slow(result, calls, delay=0.1):
+    def fn():
+        calls.append(1)
+        time.sleep(delay)
+        return result
+    return fn
+
+
+class TestMetrics:
+    def test_incr_and_snapshot(self):
+        metrics.incr("b")
+        metrics.incr("a", 3)
+        assert metrics.snapshot() == {"a": 3, "b": 1}
+        assert metrics.get("missing") == 0
+
+
+class TestSingleFlight:
+    def test_concurrent_identical_calls_share_one_execution(self):
+        flight = SingleFlight("test")
+        calls = []
+        with ThreadPoolExecutor(5) as pool:
+            results = list(pool.map(lambda _: flight.do("k", _slow("r", calls)), range(5)))
+        assert results == ["r"] * 5
+        assert len(calls) == 1
+        assert metrics.get("test.calls") == 1
+        assert metrics.get("test.coalesced") == 4
+
+    def test_distinct_keys_run_separately(self):
+        flight = SingleFlight("test")
+        calls = []
+        with ThreadPoolExecutor(2) as pool:
+            results = list(pool.map(lambda k: flight.do(k, _slow(k, calls)), ["a", "b"]))
+        assert results == ["a", "b"]
+        assert len(calls) == 2
+
+    def test_completed_calls_are_not_cached(self):
+        flight = SingleFlight("test")
+        calls = []
+        flight.do("k", _slow("r", calls, 0))
+        flight.do("k", _slow("r", calls, 0))
+        assert len(calls) == 2
+        assert flight.in_flight() == 0
+
+    def test_waiter_timeout_does_not_cancel_shared_call(self):
+        flight = SingleFlight("test")
+        calls = []
+        fn = _slow("r", calls, 0.2)
+        with ThreadPoolExecutor(1) as pool:
+            patient = pool.submit(flight.do, "k", fn)
+            time.sleep(0.02)
+            with pytest.raises(TimeoutError):
+                flight.do("k", fn, timeout=0.01)
+            assert patient.result() == "r"
+        assert len(calls) == 1
+
+    def test_exception_reaches_every_waiter(self):
+        flight = SingleFlight("test")
+
+        def boom():
+            time.sleep(0.05)
+            raise RuntimeError("backend down")
+
+        with ThreadPoolExecutor(3) as pool:
+            futures = [pool.submit(flight.do, "k", boom) for _ in range(3)]
+            for f in futures:
+                with pytest.raises(RuntimeError, match="backend down"):
+                    f.result()
+
+
+class TestCallLLMCoalescing:
+    def test_identical_prompts_share_request(self, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+        calls = []
+
+        def fake_post(prompt, model, api_key):
+            calls.append(prompt)
+            time.sleep(0.1)
+            return {"answer": "shared", "success": True}
+
+        with patch.object(llm_client, "_post_messages", fake_post):
+            with ThreadPoolExecutor(4) as pool:
+                results = list(pool.map(llm_client.call_llm, ["same prompt"] * 4))
+        assert all(r["answer"] == "shared" for r in results)
+        assert calls == ["same prompt"]
+        assert metrics.get("llm.coalesced") == 3